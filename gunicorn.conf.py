@@ -0,0 +1,16 @@
+import os
+
+# Gunicorn settings, picked up automatically by `gunicorn main:app`
+bind = "0.0.0.0:8080"
+# Each gevent worker already multiplexes worker_connections clients, so the sync-worker
+# (2 * cores) + 1 rule doesn't apply. Every worker also holds its own pool of up to
+# DB_POOL_MAX Postgres connections: keep WEB_CONCURRENCY * DB_POOL_MAX below the server's
+# max_connections (100 by default), or put PgBouncer in front (see pgbouncer.ini).
+workers = int(os.getenv("WEB_CONCURRENCY", min(os.cpu_count() or 1, 4)))
+
+# gevent workers keep serving other requests while one waits on Postgres
+worker_class = "gevent"
+worker_connections = 1000
+
+# Reuse client connections between requests instead of reconnecting per page
+keepalive = 30
@@ -1,53 +1,351 @@
-from flask import Flask, render_template, redirect, request, jsonify, session, url_for
+from flask import Flask, render_template, stream_template, redirect, request, jsonify, session, url_for
+from flask.json.provider import DefaultJSONProvider
 import resend
+import requests
+from requests.adapters import HTTPAdapter
 from werkzeug.security import generate_password_hash, check_password_hash
 import os
-import json
+import sys
+import orjson
+import hmac
+import hashlib
 import psycopg2
+import psycopg2.pool
+import psycopg2.extras
+import psycopg2.extensions
+import psycopg2.errors
 import uuid
 from datetime import datetime, timedelta
 import re
+from urllib.parse import urlparse
 import time
+import threading
+from contextlib import contextmanager
+from concurrent.futures import ThreadPoolExecutor
 
-try: 
-    from dotenv import load_dotenv
-    load_dotenv()
-except:
-    pass
+# .env files are a development convenience, production sets real env vars
+if os.getenv("FLASK_ENV") != "production":
+    try: 
+        from dotenv import load_dotenv
+        load_dotenv()
+    except:
+        pass
+
+# Let psycopg2 yield to other greenlets when running under gevent workers
+# (only probe gevent if the worker already loaded it, so other runs don't pay the import)
+if 'gevent' in sys.modules:
+    try:
+        from gevent import monkey
+        if monkey.is_module_patched('socket'):
+            from psycogreen.gevent import patch_psycopg
+            patch_psycopg()
+    except ImportError:
+        pass
 
 db_url = os.getenv("DATABASE_URL")
 resend.api_key = os.getenv("RESEND_API_KEY")
 ADMIN_CODE = os.getenv("ADMIN_CODE")
+REDIS_URL = os.getenv("REDIS_URL")
 app = Flask('app', static_folder="static", template_folder="templates")
 app.secret_key = os.getenv("SECRET_KEY", "your-secret-key-here")
 
-# Database connection helper
-def get_db_connection():
+class OrjsonProvider(DefaultJSONProvider):
+    """Flask JSON provider backed by orjson, which encodes dates and UUIDs natively"""
+    def dumps(self, obj, **kwargs):
+        # Match DefaultJSONProvider: stringify non-str keys, honour sort_keys and pretty-printing
+        option = orjson.OPT_NAIVE_UTC | orjson.OPT_UTC_Z | orjson.OPT_NON_STR_KEYS
+        if kwargs.get("sort_keys", self.sort_keys):
+            option |= orjson.OPT_SORT_KEYS
+        if kwargs.get("indent"):
+            option |= orjson.OPT_INDENT_2
+        return orjson.dumps(obj, default=self.default, option=option).decode()
+
+    def loads(self, s, **kwargs):
+        return orjson.loads(s)
+
+app.json = OrjsonProvider(app)
+
+# Shared Redis client, only used when REDIS_URL is configured
+redis_client = None
+if REDIS_URL:
+    try:
+        import redis
+        redis_client = redis.Redis.from_url(REDIS_URL)
+    except ImportError:
+        print("REDIS_URL is set but the redis package is not installed, using in-memory fallbacks")
+
+# Keep per-event session flags in Redis so the cookie only carries a session ID
+if redis_client:
+    try:
+        from flask_session import Session
+        app.config['SESSION_TYPE'] = 'redis'
+        app.config['SESSION_REDIS'] = redis_client
+        # Keep browser-session cookies, as with Flask's default cookie sessions
+        app.config['SESSION_PERMANENT'] = False
+        Session(app)
+    except ImportError:
+        print("Flask-Session is not installed, using cookie sessions")
+
+# Compress HTML/JSON responses; streamed pages are left alone so their head still flushes early
+try:
+    from flask_compress import Compress
+    app.config['COMPRESS_ALGORITHM'] = ['br', 'gzip']
+    app.config['COMPRESS_MIN_SIZE'] = 512
+    app.config['COMPRESS_STREAMS'] = False
+    Compress(app)
+except ImportError:
+    pass
+
+DB_POOL_MIN = 2
+# Per process; WEB_CONCURRENCY * DB_POOL_MAX must stay under Postgres' max_connections
+DB_POOL_MAX = int(os.getenv("DB_POOL_MAX", 20))
+DB_POOL_TIMEOUT = 10
+DB_POOL_RECYCLE = 1800
+# Connections idle longer than this get a SELECT 1 before being handed out
+DB_POOL_PING_AFTER = 30
+# libpq TCP keepalives, so dead sockets are noticed while a connection sits in the pool
+DB_KEEPALIVES = {"keepalives": 1, "keepalives_idle": 30, "keepalives_interval": 10, "keepalives_count": 5}
+# Turn off behind a transaction-mode pooler such as PgBouncer (see pgbouncer.ini)
+DB_PREPARED_STATEMENTS = os.getenv("DB_PREPARED_STATEMENTS", "true").lower() != "false"
+db_pool = None
+db_pool_lock = threading.Lock()
+db_pool_slots = threading.BoundedSemaphore(DB_POOL_MAX)
+
+# JSONB columns come back as dicts, and dicts go in through psycopg2.extras.Json
+psycopg2.extras.register_default_jsonb(globally=True, loads=orjson.loads)
+
+def json_dumps(obj):
+    """orjson encoder returning str, as psycopg2.extras.Json expects"""
+    return orjson.dumps(obj).decode()
+
+class PooledConnection(psycopg2.extensions.connection):
+    """Connection that remembers when it was opened and which statements it has prepared"""
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.created_at = time.time()
+        self.last_used = self.created_at
+        self.prepared_statements = set()
+
+class ReusingConnectionPool(psycopg2.pool.ThreadedConnectionPool):
+    """Opens minconn connections up front, but keeps up to maxconn idle for reuse"""
+    def __init__(self, minconn, maxconn, *args, **kwargs):
+        super().__init__(minconn, maxconn, *args, **kwargs)
+        # psycopg2 closes returned connections once minconn are idle, which would
+        # reconnect (and lose prepared statements) whenever more than minconn are busy
+        self.minconn = maxconn
+
+# Database connection pool helper
+def get_db_pool():
+    """Create the shared connection pool on first use"""
+    global db_pool
     if not db_url:
         return None
+    if db_pool is None:
+        with db_pool_lock:
+            if db_pool is None:
+                db_pool = ReusingConnectionPool(minconn=DB_POOL_MIN, maxconn=DB_POOL_MAX, dsn=db_url, connection_factory=PooledConnection, **DB_KEEPALIVES)
+    return db_pool
+
+def is_connection_alive(conn):
+    """Round trip a SELECT 1 to check an idle pooled connection still works"""
     try:
-        return psycopg2.connect(db_url)
-    except Exception as e:
-        print(f"Database connection error: {e}")
+        cur = conn.cursor()
+        cur.execute("SELECT 1")
+        cur.close()
+        conn.rollback()
+        return True
+    except psycopg2.Error:
+        return False
+
+# Database connection helper
+@contextmanager
+def get_db_connection(autocommit=False):
+    """
+    Borrow a pooled connection (or None if the database is unavailable) and hand it back afterwards
+    Read-only callers pass autocommit=True so no transaction is left open for the pool to roll back
+    """
+    pool = None
+    conn = None
+    # Wait for a free connection instead of failing as soon as the pool is exhausted
+    has_slot = db_pool_slots.acquire(timeout=DB_POOL_TIMEOUT)
+    try:
+        if not has_slot:
+            print("Database connection error: timed out waiting for a pooled connection")
+        else:
+            try:
+                pool = get_db_pool()
+                if pool:
+                    # Discard connections that are broken, have outlived DB_POOL_RECYCLE,
+                    # or were idle long enough to have been dropped and fail a ping.
+                    # Keep going until one passes: after a server restart every idle connection
+                    # is dead, and once they are gone the pool opens a fresh one.
+                    for _ in range(DB_POOL_MAX + 1):
+                        conn = pool.getconn()
+                        now = time.time()
+                        if not (conn.closed or now - conn.created_at > DB_POOL_RECYCLE
+                                or (now - conn.last_used > DB_POOL_PING_AFTER and not is_connection_alive(conn))):
+                            break
+                        pool.putconn(conn, close=True)
+                        conn = None
+                    if conn is None:
+                        print("Database connection error: no usable pooled connection")
+                    else:
+                        conn.autocommit = autocommit
+            except (psycopg2.pool.PoolError, psycopg2.Error) as e:
+                print(f"Database connection error: {e}")
+                conn = None
+        yield conn
+    finally:
+        if conn is not None:
+            conn.last_used = time.time()
+            if autocommit and not conn.closed:
+                conn.autocommit = False
+            pool.putconn(conn)
+        if has_slot:
+            db_pool_slots.release()
+
+# Prepared statement helper
+def execute_prepared(cur, name, query, params):
+    """PREPARE query once per pooled connection, then EXECUTE it with params"""
+    if not DB_PREPARED_STATEMENTS:
+        # Send the statement as-is, $n placeholders become named psycopg2 parameters
+        cur.execute(re.sub(r'\$(\d+)', r'%(p\1)s', query), {f"p{i}": value for i, value in enumerate(params, 1)})
+        return
+    conn = cur.connection
+    if name not in conn.prepared_statements:
+        cur.execute(f"PREPARE {name} AS {query}")
+        conn.prepared_statements.add(name)
+    placeholders = ', '.join(['%s'] * len(params))
+    cur.execute(f"EXECUTE {name} ({placeholders})", params)
+
+EVENT_CACHE_TTL = 60
+EVENT_CACHE_MAXSIZE = 1024
+REDIS_EVENT_TTL = 3600
+REDIS_COUNT_TTL = 300
+event_cache = {}
+event_cache_lock = threading.Lock()
+
+# Event cache helpers
+def get_cached_event(event_uuid):
+    """
+    Return the cached (event_data, passcode_hash, segment_id) row from Redis when configured, else from memory
+    The in-process cache is only used without Redis: invalidations only reach the worker that made them
+    """
+    entry = None
+    if not redis_client:
+        with event_cache_lock:
+            entry = event_cache.get(event_uuid)
+            if entry and time.time() - entry[0] >= EVENT_CACHE_TTL:
+                del event_cache[event_uuid]
+                entry = None
+    
+    if entry:
+        event_data, passcode_hash, segment_id = entry[1]
+    elif redis_client:
+        try:
+            cached = redis_client.get(f"event:{event_uuid}")
+        except Exception as e:
+            print(f"Redis cache error: {e}")
+            cached = None
+        if not cached:
+            return None
+        event_data, passcode_hash, segment_id = orjson.loads(cached)
+    else:
         return None
+    
+    # Hand out a copy so callers can tweak the dict without touching the cache
+    return dict(event_data), passcode_hash, segment_id
+
+def cache_event_locally(event_uuid, row):
+    with event_cache_lock:
+        event_cache.pop(event_uuid, None)
+        if len(event_cache) >= EVENT_CACHE_MAXSIZE:
+            # Evict the oldest entry
+            del event_cache[next(iter(event_cache))]
+        event_cache[event_uuid] = (time.time(), row)
+
+def cache_event(event_uuid, row):
+    if redis_client:
+        try:
+            redis_client.setex(f"event:{event_uuid}", REDIS_EVENT_TTL, orjson.dumps(row))
+        except Exception as e:
+            print(f"Redis cache error: {e}")
+    else:
+        cache_event_locally(event_uuid, row)
+
+def invalidate_cached_event(event_uuid):
+    with event_cache_lock:
+        event_cache.pop(event_uuid, None)
+    if redis_client:
+        try:
+            redis_client.delete(f"event:{event_uuid}")
+        except Exception as e:
+            print(f"Redis cache error: {e}")
 
 # Validate URL helper
 def isValidUrl(url):
     try:
-        from urllib.parse import urlparse
         result = urlparse(url)
         return all([result.scheme, result.netloc])
     except:
         return False
 
 # Email validation helper
+EMAIL_PATTERN = re.compile(r'^[a-zA-Z0-9._%+-]+@[a-zA-Z0-9.-]+\.[a-zA-Z]{2,}$')
+
 def isValidEmail(email):
-    pattern = r'^[a-zA-Z0-9._%+-]+@[a-zA-Z0-9.-]+\.[a-zA-Z]{2,}$'
-    return re.match(pattern, email) is not None
+    return EMAIL_PATTERN.match(email) is not None
+
+# Admin code validation helper
+def isValidAdminCode(admin_code):
+    """Constant-time comparison against ADMIN_CODE"""
+    if not admin_code or not ADMIN_CODE:
+        return False
+    return hmac.compare_digest(admin_code.encode(), ADMIN_CODE.encode())
+
+VERIFIED_PASSCODES_MAXSIZE = 1024
+verified_passcodes = {}
+verified_passcodes_lock = threading.Lock()
+
+# Passcode verification helper
+def verify_passcode(passcode_hash, password):
+    """check_password_hash that remembers successful checks, so repeat logins skip the KDF"""
+    # Only a digest of the password is kept, and failed guesses are never cached
+    key = (passcode_hash, hashlib.sha256(password.encode()).hexdigest())
+    with verified_passcodes_lock:
+        if key in verified_passcodes:
+            return True
+    
+    if not check_password_hash(passcode_hash, password):
+        return False
+    
+    with verified_passcodes_lock:
+        if len(verified_passcodes) >= VERIFIED_PASSCODES_MAXSIZE:
+            # Evict the oldest entry
+            del verified_passcodes[next(iter(verified_passcodes))]
+        verified_passcodes[key] = True
+    return True
 
 # Rate limiting helper
-def is_rate_limited(key, max_requests=5, window_seconds=300):
-    """Simple in-memory rate limiting"""
+def is_rate_limited(key, max_requests=5, window_seconds=300, record=True):
+    """
+    Fixed-window counter in Redis when available (shared by all workers), in-memory otherwise
+    With record=False it only checks the limit, without counting this request as a hit
+    """
+    if redis_client:
+        try:
+            redis_key = f"ratelimit:{key}"
+            if not record:
+                return int(redis_client.get(redis_key) or 0) >= max_requests
+            pipe = redis_client.pipeline()
+            # Start the window on the first hit, then count every hit inside it
+            pipe.set(redis_key, 0, ex=window_seconds, nx=True)
+            pipe.incr(redis_key)
+            _, count = pipe.execute()
+            return count > max_requests
+        except Exception as e:
+            print(f"Redis rate limit error, falling back to in-memory: {e}")
+    
     if not hasattr(is_rate_limited, 'requests'):
         is_rate_limited.requests = {}
     
@@ -66,80 +364,181 @@ def is_rate_limited(key, max_requests=5, window_seconds=300):
         return True
     
     # Add current request
-    is_rate_limited.requests[key].append(now)
+    if record:
+        is_rate_limited.requests[key].append(now)
     return False
 
 # Initialize database tables
 def init_db():
-    conn = get_db_connection()
-    if not conn: return False
-    try:
-        cur = conn.cursor()
-        # Events table with segment_id field
-        cur.execute("""
-            CREATE TABLE IF NOT EXISTS events (
-                id SERIAL PRIMARY KEY,
-                uuid VARCHAR(36) UNIQUE NOT NULL,
-                passcode_hash VARCHAR(255),
-                event_data JSONB NOT NULL,
-                segment_id VARCHAR(36),
-                date_created TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
-                date_updated TIMESTAMP DEFAULT CURRENT_TIMESTAMP
-            )
-        """)
+    with get_db_connection() as conn:
+        if not conn: return False
+        try:
+            cur = conn.cursor()
+            # Tables and indexes are created in a single round trip
+            cur.execute("""
+                -- Events table with segment_id field
+                CREATE TABLE IF NOT EXISTS events (
+                    id SERIAL PRIMARY KEY,
+                    uuid UUID UNIQUE NOT NULL,
+                    passcode_hash VARCHAR(255),
+                    event_data JSONB NOT NULL,
+                    segment_id VARCHAR(36),
+                    date_created TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+                    date_updated TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+                );
+                
+                -- Updated RSVPs table with verification fields and segment_id
+                CREATE TABLE IF NOT EXISTS rsvps (
+                    id SERIAL PRIMARY KEY,
+                    event_uuid UUID NOT NULL,
+                    name VARCHAR(255) NOT NULL,
+                    email VARCHAR(255) NOT NULL,
+                    phone VARCHAR(20),
+                    additional_info TEXT,
+                    email_verified BOOLEAN DEFAULT FALSE,
+                    verification_token VARCHAR(36),
+                    segment_id VARCHAR(36),
+                    segment_error TEXT,
+                    rsvp_date TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+                    FOREIGN KEY (event_uuid) REFERENCES events(uuid)
+                );
+                
+                -- Duplicate RSVP checks match on normalized email and phone
+                CREATE INDEX IF NOT EXISTS rsvps_event_email_idx ON rsvps(event_uuid, LOWER(TRIM(email)));
+                CREATE INDEX IF NOT EXISTS rsvps_event_phone_idx ON rsvps(event_uuid, TRIM(phone));
+                
+                -- Admin warning counts only touch the (usually few) problem rows
+                CREATE INDEX IF NOT EXISTS rsvps_unverified_idx ON rsvps(event_uuid, rsvp_date) WHERE email_verified = FALSE;
+                CREATE INDEX IF NOT EXISTS rsvps_segment_error_idx ON rsvps(event_uuid) WHERE segment_error IS NOT NULL;
+                
+                -- Admin attendee pages seek on (rsvp_date, id) newest first, without sorting.
+                -- It also leads with event_uuid, so it serves plain per-event lookups and counts,
+                -- and the old single-column index is dropped to keep RSVP inserts cheaper.
+                CREATE INDEX IF NOT EXISTS rsvps_event_page_idx ON rsvps(event_uuid, rsvp_date DESC, id DESC);
+                DROP INDEX IF EXISTS rsvps_event_uuid_idx;
+            """)
+            conn.commit()
+        except Exception as e:
+            print(f"Database initialization error: {e}")
+            return False
         
-        # Updated RSVPs table with verification fields and segment_id
-        cur.execute("""
-            CREATE TABLE IF NOT EXISTS rsvps (
-                id SERIAL PRIMARY KEY,
-                event_uuid VARCHAR(36) NOT NULL,
-                name VARCHAR(255) NOT NULL,
-                email VARCHAR(255) NOT NULL,
-                phone VARCHAR(20),
-                additional_info TEXT,
-                email_verified BOOLEAN DEFAULT FALSE,
-                verification_token VARCHAR(36),
-                segment_id VARCHAR(36),
-                segment_error TEXT,
-                rsvp_date TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
-                FOREIGN KEY (event_uuid) REFERENCES events(uuid)
-            )
-        """)
-        conn.commit()
+        # Names are unique per event; the INSERT itself rejects concurrent duplicates.
+        # Built separately so existing duplicate rows only skip this index instead of failing startup.
+        try:
+            cur.execute("CREATE UNIQUE INDEX IF NOT EXISTS rsvps_event_name_uniq ON rsvps(event_uuid, LOWER(TRIM(name)))")
+            conn.commit()
+        except Exception as e:
+            conn.rollback()
+            print(f"Skipping unique RSVP name index: {e}")
         cur.close()
-        conn.close()
         return True
-    except Exception as e:
-        print(f"Database initialization error: {e}")
-        return False
 
-def send_verification_email(email, name, token):
-    verify_url = url_for('verify_email', token=token, _external=True)
-    params = {
-        "from": "verify@email.vivaan.dev", # Replace with your verified domain in production
-        "to": email,
-        "subject": "Verify your RSVP",
-        "html": f"""
-            <div style="font-family: sans-serif; padding: 20px; border: 1px solid #eee;">
-                <h2>Hi {name}!</h2>
-                <p>Thanks for RSVPing. Please click the button below to verify your email address:</p>
-                <a href="{verify_url}" style="background: #e63946; color: white; padding: 10px 20px; text-decoration: none; border-radius: 5px; display: inline-block;">Verify Email</a>
-                <p style="margin-top: 20px; font-size: 0.8rem; color: #666;">If you didn't request this, you can ignore this email.</p>
-            </div>
-        """
-    }
+# One-shot schema setup, run once per deploy before starting gunicorn:
+#   flask --app main init-db && gunicorn main:app
+@app.cli.command("init-db")
+def init_db_command():
+    """Create the database tables and indexes"""
+    if not db_url:
+        print("No DATABASE_URL provided, nothing to initialize")
+        sys.exit(1)
+    print("Initializing database...")
+    if not init_db():
+        print("Database initialization failed")
+        sys.exit(1)
+    print("Database initialized successfully")
+
+class ResendSessionClient(resend.HTTPClient):
+    """Resend transport that keeps HTTPS connections to the API open between sends"""
+    def __init__(self, timeout=30):
+        self.timeout = timeout
+        self.session = requests.Session()
+        self.session.mount("https://", HTTPAdapter(pool_connections=10, pool_maxsize=20))
+
+    def request(self, method, url, headers, json=None, files=None, data=None):
+        try:
+            resp = self.session.request(
+                method=method,
+                url=url,
+                headers=headers,
+                json=json if data is None and files is None else None,
+                files=files,
+                data=data,
+                timeout=self.timeout,
+            )
+            return resp.content, resp.status_code, resp.headers
+        except requests.RequestException as e:
+            # Resend turns this into a ResendError, same as its default client
+            raise RuntimeError(f"Request failed: {e}") from e
+
+resend.default_http_client = ResendSessionClient()
+
+# Background task helper
+background_executor = ThreadPoolExecutor(max_workers=4)
+
+def run_in_background(func, *args):
+    """Run func off the request thread so slow API calls don't hold the response"""
+    future = background_executor.submit(func, *args)
+    future.add_done_callback(log_background_error)
+
+def log_background_error(future):
+    """Print exceptions from background tasks, which would otherwise vanish with the future"""
+    e = future.exception()
+    if e:
+        print(f"Background task error: {e!r}")
+
+def send_verification_email(email, name, verify_url):
     try:
+        # Runs on a background thread, so push an app context for the template;
+        # Jinja escapes the attendee's name, and the compiled template is reused
+        with app.app_context():
+            html = render_template("verify_email.html", name=name, verify_url=verify_url)
+        params = {
+            "from": "verify@email.vivaan.dev", # Replace with your verified domain in production
+            "to": email,
+            "subject": "Verify your RSVP",
+            "html": html
+        }
         resend.Emails.send(params)
         return True
     except Exception as e:
-        print(f"Resend error: {e}")
+        print(f"Failed to send verification email to {email}: {e}")
         return False
 
+# Emails added to each segment within the last week, so repeat RSVPs skip the Resend round trips.
+# Stored as a sorted set scored by add time, so each entry expires on its own.
+SEGMENT_MEMBERS_TTL = 7 * 24 * 3600
+
+def is_segment_member(email, segment_id):
+    if redis_client:
+        try:
+            added_at = redis_client.zscore(f"segment:{segment_id}:contacts", email.strip().lower())
+            return added_at is not None and time.time() - added_at < SEGMENT_MEMBERS_TTL
+        except Exception as e:
+            print(f"Redis cache error: {e}")
+    return False
+
+def remember_segment_member(email, segment_id):
+    if redis_client:
+        try:
+            key = f"segment:{segment_id}:contacts"
+            now = time.time()
+            pipe = redis_client.pipeline()
+            pipe.zadd(key, {email.strip().lower(): now})
+            # Drop entries older than a week, and the whole set once a segment stops getting signups
+            pipe.zremrangebyscore(key, "-inf", now - SEGMENT_MEMBERS_TTL)
+            pipe.expire(key, SEGMENT_MEMBERS_TTL)
+            pipe.execute()
+        except Exception as e:
+            print(f"Redis cache error: {e}")
+
 def add_contact_to_segment(email, name, segment_id):
     """Add contact to Resend segment"""
     if not segment_id:
         return None, "No segment ID provided"
     
+    if is_segment_member(email, segment_id):
+        return True, None
+    
     try:
         # First create the contact
         contact_params = {
@@ -161,6 +560,7 @@ def add_contact_to_segment(email, name, segment_id):
         }
         
         response = resend.Contacts.Segments.add(segment_params)
+        remember_segment_member(email, segment_id)
         return True, None
         
     except Exception as e:
@@ -168,48 +568,169 @@ def add_contact_to_segment(email, name, segment_id):
         print(error_msg)
         return False, error_msg
 
+def sync_rsvp_to_segment(email, name, segment_id, verification_token):
+    """Add an RSVP to the event's Resend segment and record any failure on the RSVP row"""
+    segment_success, segment_error = add_contact_to_segment(email, name, segment_id)
+    if not segment_error:
+        return
+    
+    with get_db_connection() as conn:
+        if not conn:
+            return
+        try:
+            cur = conn.cursor()
+            cur.execute("UPDATE rsvps SET segment_error = %s WHERE verification_token = %s", (segment_error, verification_token))
+            conn.commit()
+            cur.close()
+        except Exception as e:
+            print(f"Error recording segment error: {e}")
+
 # Load event from database
 def load_event(event_uuid):
-    conn = get_db_connection()
-    if not conn:
-        return None
+    cached = get_cached_event(event_uuid)
+    if cached:
+        return cached[0]
     
-    try:
-        cur = conn.cursor()
-        cur.execute("SELECT event_data FROM events WHERE uuid = %s", (event_uuid,))
-        result = cur.fetchone()
-        cur.close()
-        conn.close()
+    with get_db_connection(autocommit=True) as conn:
+        if not conn:
+            return None
         
-        if result:
-            return json.loads(result[0]) if isinstance(result[0], str) else result[0]
-        return None
-    except Exception as e:
-        print(f"Error loading event {event_uuid}: {e}")
-        return None
+        try:
+            cur = conn.cursor(cursor_factory=psycopg2.extras.RealDictCursor)
+            execute_prepared(cur, "load_event", "SELECT event_data FROM events WHERE uuid = $1", (event_uuid,))
+            result = cur.fetchone()
+            cur.close()
+            
+            if result:
+                return result['event_data']
+            return None
+        except Exception as e:
+            print(f"Error loading event {event_uuid}: {e}")
+            return None
 
 # Get event with passcode verification
 def get_event_from_db(event_uuid):
-    conn = get_db_connection()
-    if not conn:
-        return None, None
+    cached = get_cached_event(event_uuid)
+    if cached:
+        return cached
     
-    try:
+    with get_db_connection(autocommit=True) as conn:
+        if not conn:
+            return None, None, None
+        
+        try:
+            cur = conn.cursor(cursor_factory=psycopg2.extras.RealDictCursor)
+            execute_prepared(cur, "get_event", "SELECT event_data, passcode_hash, segment_id FROM events WHERE uuid = $1", (event_uuid,))
+            result = cur.fetchone()
+            cur.close()
+            
+            if result:
+                event_data = result['event_data']
+                passcode_hash = result['passcode_hash']
+                segment_id = result['segment_id']
+                cache_event(event_uuid, (event_data, passcode_hash, segment_id))
+                return dict(event_data), passcode_hash, segment_id
+            return None, None, None
+        except Exception as e:
+            print(f"Error loading event {event_uuid}: {e}")
+            return None, None, None
+
+# Get event and its RSVP count for the event page
+def get_event_with_rsvp_count(event_uuid):
+    """
+    Returns (event_data, passcode_hash, segment_id, rsvp_count)
+    When the event isn't cached both come back from a single query
+    """
+    cached = get_cached_event(event_uuid)
+    if cached:
+        return (*cached, get_rsvp_count(event_uuid))
+    
+    with get_db_connection(autocommit=True) as conn:
+        if not conn:
+            return None, None, None, 0
+        
+        try:
+            cur = conn.cursor(cursor_factory=psycopg2.extras.RealDictCursor)
+            execute_prepared(cur, "get_event_with_rsvp_count", """
+                SELECT e.event_data, e.passcode_hash, e.segment_id,
+                    (SELECT COUNT(*) FROM rsvps r WHERE r.event_uuid = e.uuid) AS rsvp_count
+                FROM events e WHERE e.uuid = $1
+            """, (event_uuid,))
+            result = cur.fetchone()
+            cur.close()
+        except Exception as e:
+            print(f"Error loading event {event_uuid}: {e}")
+            return None, None, None, 0
+    
+    if not result:
+        return None, None, None, 0
+    
+    event_data = result['event_data']
+    passcode_hash = result['passcode_hash']
+    segment_id = result['segment_id']
+    cache_event(event_uuid, (event_data, passcode_hash, segment_id))
+    cache_rsvp_count(event_uuid, result['rsvp_count'])
+    return dict(event_data), passcode_hash, segment_id, result['rsvp_count']
+
+# RSVP write statements, prepared once per pooled connection through execute_prepared
+INSERT_RSVP_SQL = """
+    INSERT INTO rsvps (event_uuid, name, email, phone, additional_info, verification_token, segment_id)
+    VALUES ($1, $2, $3, $4, $5, $6, $7)
+"""
+
+INSERT_CONFIRMED_RSVP_SQL = """
+    INSERT INTO rsvps (event_uuid, name, email, phone, additional_info)
+    VALUES ($1, $2, $3, $4, $5)
+"""
+
+# Atomically bump the registered counter inside event_data
+INCREMENT_REGISTERED_SQL = """
+    UPDATE events SET
+        event_data = jsonb_set(event_data, '{registered}', (COALESCE((event_data->>'registered')::int, 0) + 1)::text::jsonb),
+        date_updated = CURRENT_TIMESTAMP
+    WHERE uuid = $1
+"""
+
+# Count RSVPs for an event, cached in Redis between registrations
+def get_cached_rsvp_count(event_uuid):
+    if redis_client:
+        try:
+            cached = redis_client.get(f"event:{event_uuid}:rsvp_count")
+            if cached is not None:
+                return int(cached)
+        except Exception as e:
+            print(f"Redis cache error: {e}")
+    return None
+
+def cache_rsvp_count(event_uuid, rsvp_count):
+    if redis_client:
+        try:
+            redis_client.setex(f"event:{event_uuid}:rsvp_count", REDIS_COUNT_TTL, rsvp_count)
+        except Exception as e:
+            print(f"Redis cache error: {e}")
+
+def get_rsvp_count(event_uuid):
+    rsvp_count = get_cached_rsvp_count(event_uuid)
+    if rsvp_count is not None:
+        return rsvp_count
+    
+    with get_db_connection(autocommit=True) as conn:
+        if not conn:
+            return 0
         cur = conn.cursor()
-        cur.execute("SELECT event_data, passcode_hash, segment_id FROM events WHERE uuid = %s", (event_uuid,))
-        result = cur.fetchone()
+        execute_prepared(cur, "rsvp_count", "SELECT COUNT(*) FROM rsvps WHERE event_uuid = $1", (event_uuid,))
+        rsvp_count = cur.fetchone()[0]
         cur.close()
-        conn.close()
-        
-        if result:
-            event_data = json.loads(result[0]) if isinstance(result[0], str) else result[0]
-            passcode_hash = result[1]
-            segment_id = result[2]
-            return event_data, passcode_hash, segment_id
-        return None, None, None
-    except Exception as e:
-        print(f"Error loading event {event_uuid}: {e}")
-        return None, None, None
+    
+    cache_rsvp_count(event_uuid, rsvp_count)
+    return rsvp_count
+
+def invalidate_rsvp_count(event_uuid):
+    if redis_client:
+        try:
+            redis_client.delete(f"event:{event_uuid}:rsvp_count")
+        except Exception as e:
+            print(f"Redis cache error: {e}")
 
 # Check for duplicate RSVP by name, email, or phone
 def check_rsvp_duplicate(event_uuid, name, email, phone):
@@ -217,108 +738,227 @@ def check_rsvp_duplicate(event_uuid, name, email, phone):
     Check if an RSVP already exists for this event
     Returns (is_duplicate, duplicate_fields, existing_rsvp)
     """
-    conn = get_db_connection()
-    if not conn:
-        return False, [], None
+    with get_db_connection(autocommit=True) as conn:
+        if not conn:
+            return False, [], None
+        
+        try:
+            cur = conn.cursor(cursor_factory=psycopg2.extras.RealDictCursor)
+            # Only fetch the few rows that actually collide, name matches first
+            execute_prepared(cur, "check_rsvp_duplicate", """
+                SELECT id, name, email, phone FROM rsvps 
+                WHERE event_uuid = $1
+                AND (
+                    LOWER(TRIM(name)) = LOWER(TRIM($2))
+                    OR LOWER(TRIM(email)) = LOWER(TRIM($3))
+                    OR TRIM(phone) = TRIM($4)
+                )
+                ORDER BY LOWER(TRIM(name)) = LOWER(TRIM($2)) DESC, id
+                LIMIT 5
+            """, (event_uuid, name, email or None, phone or None))
+            existing_rsvps = cur.fetchall()
+            cur.close()
+        except Exception as e:
+            print(f"Error checking RSVP duplicate: {e}")
+            return False, [], None
     
-    try:
-        cur = conn.cursor()
-        cur.execute("""
-            SELECT id, name, email, phone FROM rsvps 
-            WHERE event_uuid = %s
-        """, (event_uuid,))
-        existing_rsvps = cur.fetchall()
-        cur.close()
-        conn.close()
+    duplicate_fields = []
+    for rsvp in existing_rsvps:
+        existing_name = rsvp['name']
+        existing_email = rsvp['email']
+        existing_phone = rsvp['phone']
         
-        duplicate_fields = []
-        for rsvp in existing_rsvps:
-            _, existing_name, existing_email, existing_phone = rsvp
-            
-            # Check for exact name match (case-insensitive)
-            if name.lower().strip() == existing_name.lower().strip():
-                return True, ['name'], rsvp
-            
-            # Check for email match
-            if email and existing_email and email.lower().strip() == existing_email.lower().strip():
-                duplicate_fields.append('email')
-            
-            # Check for phone match
-            if phone and existing_phone and phone.strip() == existing_phone.strip():
-                duplicate_fields.append('phone')
-            
-            if duplicate_fields:
-                return False, duplicate_fields, rsvp
+        # Check for exact name match (case-insensitive)
+        if name.lower().strip() == existing_name.lower().strip():
+            return True, ['name'], rsvp
         
-        return False, [], None
-    except Exception as e:
-        print(f"Error checking RSVP duplicate: {e}")
-        return False, [], None
+        # Check for email match
+        if email and existing_email and email.lower().strip() == existing_email.lower().strip():
+            duplicate_fields.append('email')
+        
+        # Check for phone match
+        if phone and existing_phone and phone.strip() == existing_phone.strip():
+            duplicate_fields.append('phone')
+        
+        if duplicate_fields:
+            return False, duplicate_fields, rsvp
+    
+    return False, [], None
+
+# Save events to database in batches
+def save_events_to_db(events):
+    """
+    Upsert a list of (event_data, passcode, segment_id) tuples, up to 100 rows per round trip
+    Returns the list of saved uuids, or None on failure
+    """
+    rows = []
+    for event_data, passcode, segment_id in events:
+        # Only hash the password if one was actually passed in
+        passcode_hash = generate_password_hash(passcode) if passcode else None
+        rows.append((event_data.get('uuid'), passcode_hash, psycopg2.extras.Json(event_data, dumps=json_dumps), segment_id))
+    
+    with get_db_connection() as conn:
+        if not conn:
+            return None
+        
+        try:
+            cur = conn.cursor()
+            # Using COALESCE in the UPDATE ensures that if EXCLUDED.passcode_hash is NULL, 
+            # it keeps the existing value in the table.
+            results = psycopg2.extras.execute_values(cur, """
+                INSERT INTO events (uuid, passcode_hash, event_data, segment_id, date_updated)
+                VALUES %s
+                ON CONFLICT (uuid) DO UPDATE SET
+                    passcode_hash = COALESCE(EXCLUDED.passcode_hash, events.passcode_hash),
+                    event_data = EXCLUDED.event_data,
+                    segment_id = COALESCE(EXCLUDED.segment_id, events.segment_id),
+                    date_updated = CURRENT_TIMESTAMP
+                RETURNING uuid, passcode_hash, segment_id
+            """, rows, template="(%s, %s, %s, %s, CURRENT_TIMESTAMP)", page_size=100, fetch=True)
+            conn.commit()
+            cur.close()
+        except Exception as e:
+            print(f"Error saving event to database: {e}")
+            return None
+    
+    # Warm the cache with what was just written so the next read skips the SELECT
+    events_by_uuid = {str(event_data.get('uuid')): event_data for event_data, _, _ in events}
+    saved_uuids = []
+    for event_uuid, passcode_hash, segment_id in results:
+        event_uuid = str(event_uuid)
+        cache_event(event_uuid, (dict(events_by_uuid[event_uuid]), passcode_hash, segment_id))
+        saved_uuids.append(event_uuid)
+    return saved_uuids
 
 # Save event to database
 def save_event_to_db(event_data, passcode=None, segment_id=None):
-    conn = get_db_connection()
-    if not conn:
-        return None
+    saved_uuids = save_events_to_db([(event_data, passcode, segment_id)])
+    return saved_uuids[0] if saved_uuids else None
+
+# Build event data from the create-event form
+def build_event_from_form(form):
+    """
+    Validate the create-event form fields
+    Returns (event_data, error)
+    """
+    # Validate all required fields
+    title = form.get('title', '').strip()
+    description = form.get('description', '').strip()
+    date = form.get('date', '').strip()
+    time = form.get('time', '').strip()
+    location = form.get('location', '').strip()
+    address = form.get('address', '').strip()
+    organizer = form.get('organizer', '').strip()
+    
+    # Optional fields
+    capacity = form.get('capacity', '').strip()
+    price = form.get('price', '').strip()
+    image = form.get('image', '').strip()
+    tags = form.get('tags', '').strip()
+    
+    # Check required fields are present
+    if not all([title, description, date, time, location, address, organizer]):
+        return None, "All marked fields (*) are required"
     
+    # Validate optional numeric fields if provided
     try:
-        cur = conn.cursor()
-        event_uuid = event_data.get('uuid')
-        
-        # Only hash the password if one was actually passed in
-        passcode_hash = generate_password_hash(passcode) if passcode else None
-        
-        # Using COALESCE in the UPDATE ensures that if EXCLUDED.passcode_hash is NULL, 
-        # it keeps the existing value in the table.
-        cur.execute("""
-            INSERT INTO events (uuid, passcode_hash, event_data, segment_id, date_updated)
-            VALUES (%s, %s, %s, %s, CURRENT_TIMESTAMP)
-            ON CONFLICT (uuid) DO UPDATE SET
-                passcode_hash = COALESCE(EXCLUDED.passcode_hash, events.passcode_hash),
-                event_data = EXCLUDED.event_data,
-                segment_id = COALESCE(EXCLUDED.segment_id, events.segment_id),
-                date_updated = CURRENT_TIMESTAMP
-            RETURNING uuid
-        """, (event_uuid, passcode_hash, json.dumps(event_data), segment_id))
+        if capacity:
+            capacity = int(capacity)
+            if capacity < 1:
+                raise ValueError("Capacity must be at least 1")
+        else:
+            capacity = None
         
-        result = cur.fetchone()
-        conn.commit()
-        cur.close()
-        conn.close()
-        return result[0] if result else None
-    except Exception as e:
-        print(f"Error saving event to database: {e}")
-        return None
+        if price:
+            price = float(price)
+            if price < 0:
+                raise ValueError("Price cannot be negative")
+        else:
+            price = None
+    except ValueError as e:
+        return None, f"Invalid capacity or price: {str(e)}"
+    
+    # Validate image URL if provided
+    if image and not isValidUrl(image):
+        return None, "Image URL must be a valid URL"
+    
+    # Create new event data
+    event_data = {
+        'uuid': str(uuid.uuid4()),
+        'title': title,
+        'description': description,
+        'date': date,
+        'time': time,
+        'location': location,
+        'address': address,
+        'capacity': capacity,
+        'registered': 0,
+        'price': price,
+        'organizer': organizer,
+        'tags': [tag.strip() for tag in tags.split(',') if tag.strip()] if tags else [],
+        'image': image if image else None
+    }
+    return event_data, None
+
+# Messages shown on the event page for each rsvp_error code
+RSVP_ERROR_MESSAGES = {
+    "required_fields": "Name and email are required",
+    "name_taken": "Someone with that name has already registered for this event. Please use a different name.",
+    "save_failed": "Error saving RSVP. Please try again.",
+    "invalid_email": "Please enter a valid email address.",
+    "invalid_name": "Name must be between 2 and 100 characters.",
+    "invalid_phone": "Please enter a valid phone number (10-20 characters).",
+}
+
+index_html = None
+index_etag = None
 
 @app.route("/")
 def index():
-    return render_template("index.html")
+    global index_html, index_etag
+    # The home page has no template variables, so render it once and reuse the HTML
+    if index_html is None:
+        index_html = render_template("index.html")
+        index_etag = hashlib.sha256(index_html.encode()).hexdigest()
+    # Revalidations after max-age get a bodyless 304
+    response = app.response_class(index_html, headers={'Cache-Control': 'public, max-age=300'})
+    response.set_etag(index_etag)
+    return response.make_conditional(request)
 
 @app.route("/event/<event_uuid>")
 def event_page(event_uuid):
     """Display event page with optional password protection"""
-    event, passcode_hash, segment_id = get_event_from_db(event_uuid)
-    if not event:
-        return "Event not found", 404
-    
-    # Check if password is correct and provided
     session_key = f'event_{event_uuid}_authenticated'
     password = request.args.get('password')
+    authenticated = session.get(session_key)
     
-    # If event has no password, always allow access
-    if not passcode_hash:
-        session[session_key] = True
-    # If password is provided, verify it
-    elif password:
-        if check_password_hash(passcode_hash, password):
+    # Block IPs with too many wrong passcodes before they reach the database;
+    # only failed guesses count, so a shared ?password= link works for a whole venue
+    client_ip = request.environ.get('HTTP_X_FORWARDED_FOR', request.environ.get('REMOTE_ADDR', 'unknown'))
+    if password and not authenticated:
+        if is_rate_limited(f"passcode_{client_ip}", max_requests=10, window_seconds=300, record=False):
+            return "Too many passcode attempts. Please try again later.", 429
+    
+    event, passcode_hash, segment_id, rsvp_count = get_event_with_rsvp_count(event_uuid)
+    if not event:
+        return "Event not found", 404
+    
+    # Sessions that already passed the check skip it entirely
+    if not authenticated:
+        # If event has no password, always allow access
+        if not passcode_hash:
             session[session_key] = True
-            return redirect(url_for('event_page', event_uuid=event_uuid))
+        # If password is provided, verify it
+        elif password:
+            if verify_passcode(passcode_hash, password):
+                session[session_key] = True
+                return redirect(url_for('event_page', event_uuid=event_uuid))
+            else:
+                is_rate_limited(f"passcode_{client_ip}", max_requests=10, window_seconds=300)
+                return render_template("password_entry.html", event_uuid=event_uuid, event_title=event.get('title', 'Event'), error="Invalid passcode")
         else:
-            return render_template("password_entry.html", event_uuid=event_uuid, event_title=event.get('title', 'Event'), error="Invalid passcode")
-    # Check if already authenticated in session
-    elif not session.get(session_key):
-        # Show password entry form
-        return render_template("password_entry.html", event_uuid=event_uuid, event_title=event.get('title', 'Event'))
+            # Show password entry form
+            return render_template("password_entry.html", event_uuid=event_uuid, event_title=event.get('title', 'Event'))
     
     # Get URL parameters for messages
     rsvp_success = request.args.get('rsvp_success')
@@ -328,53 +968,20 @@ def event_page(event_uuid):
     pending_rsvp = session.get(f'pending_rsvp_{event_uuid}')
     
     # Build error message based on error code
-    error_message = None
-    if rsvp_error:
-        if rsvp_error == "required_fields":
-            error_message = "Name and email are required"
-        elif rsvp_error == "name_taken":
-            error_message = "Someone with that name has already registered for this event. Please use a different name."
-        elif rsvp_error == "save_failed":
-            error_message = "Error saving RSVP. Please try again."
-        elif rsvp_error == "invalid_email":
-            error_message = "Please enter a valid email address."
-        elif rsvp_error == "invalid_name":
-            error_message = "Name must be between 2 and 100 characters."
-        elif rsvp_error == "invalid_phone":
-            error_message = "Please enter a valid phone number (10-20 characters)."
-        else:
-            error_message = rsvp_error
+    error_message = RSVP_ERROR_MESSAGES.get(rsvp_error, rsvp_error) if rsvp_error else None
     
     # Build warning message based on warning flag and session data
     warning_message = None
     if rsvp_warning and pending_rsvp:
-        warning_fields = []
-        if 'email' in request.args.get('rsvp_fields', '').split(','):
-            warning_fields.append(f"Email: {pending_rsvp.get('email')}")
-        if 'phone' in request.args.get('rsvp_fields', '').split(','):
-            warning_fields.append(f"Phone: {pending_rsvp.get('phone')}")
+        # rsvp_event already worked out which fields collide, so reuse that instead of re-querying
+        duplicate_fields = []
+        if 'email' in pending_rsvp.get('duplicate_fields', []):
+            duplicate_fields.append(f"Email ({pending_rsvp.get('email')})")
+        if 'phone' in pending_rsvp.get('duplicate_fields', []):
+            duplicate_fields.append(f"Phone ({pending_rsvp.get('phone')})")
         
-        # Check what fields are duplicated by looking at the actual data
-        conn = get_db_connection()
-        if conn:
-            duplicate_fields = []
-            cur = conn.cursor()
-            cur.execute("""
-                SELECT email, phone FROM rsvps 
-                WHERE event_uuid = %s
-            """, (event_uuid,))
-            existing_rsvps = cur.fetchall()
-            cur.close()
-            conn.close()
-            
-            for existing_email, existing_phone in existing_rsvps:
-                if pending_rsvp.get('email') and existing_email and pending_rsvp.get('email').lower() == existing_email.lower():
-                    duplicate_fields.append(f"Email ({pending_rsvp.get('email')})")
-                if pending_rsvp.get('phone') and existing_phone and pending_rsvp.get('phone') == existing_phone:
-                    duplicate_fields.append(f"Phone ({pending_rsvp.get('phone')})")
-            
-            if duplicate_fields:
-                warning_message = f"Warning: The following information is already registered: {', '.join(duplicate_fields)}. You can still register if you'd like."
+        if duplicate_fields:
+            warning_message = f"Warning: The following information is already registered: {', '.join(duplicate_fields)}. You can still register if you'd like."
     
     # Prepare template context
     context = {'event': event}
@@ -387,22 +994,17 @@ def event_page(event_uuid):
         context['rsvp_warning_data'] = pending_rsvp
         context['show_confirm'] = True
     
-    # Fetch actual RSVP count from DB instead of just the JSON counter
-    conn = get_db_connection()
-    rsvp_count = 0
-    if conn:
-        cur = conn.cursor()
-        cur.execute("SELECT COUNT(*) FROM rsvps WHERE event_uuid = %s", (event_uuid,))
-        rsvp_count = cur.fetchone()[0]
-        cur.close()
-        conn.close()
-
-    # Pass rsvp_count to template
-    return render_template("event.html", rsvp_count=rsvp_count, **context)
+    # Pass rsvp_count to template, streaming it so the head goes out while the body renders
+    return stream_template("event.html", rsvp_count=rsvp_count, **context)
 
 @app.route("/event/<event_uuid>/authenticate", methods=["POST"])
 def authenticate_event(event_uuid):
     """Handle event password authentication"""
+    # Block IPs with too many wrong passcodes before they reach the database (only failures count)
+    client_ip = request.environ.get('HTTP_X_FORWARDED_FOR', request.environ.get('REMOTE_ADDR', 'unknown'))
+    if is_rate_limited(f"passcode_{client_ip}", max_requests=10, window_seconds=300, record=False):
+        return "Too many passcode attempts. Please try again later.", 429
+    
     event, passcode_hash, segment_id = get_event_from_db(event_uuid)
     if not event:
         return "Event not found", 404
@@ -413,10 +1015,11 @@ def authenticate_event(event_uuid):
         return redirect(url_for('event_page', event_uuid=event_uuid))
     
     password = request.form.get('password', '')
-    if check_password_hash(passcode_hash, password):
+    if verify_passcode(passcode_hash, password):
         session[f'event_{event_uuid}_authenticated'] = True
         return redirect(url_for('event_page', event_uuid=event_uuid))
     else:
+        is_rate_limited(f"passcode_{client_ip}", max_requests=10, window_seconds=300)
         return render_template("password_entry.html", event_uuid=event_uuid, event_title=event.get('title', 'Event'), error="Invalid passcode")
 
 @app.route("/event/<event_uuid>/rsvp", methods=["POST"])
@@ -470,68 +1073,65 @@ def rsvp_event(event_uuid):
             'name': name,
             'email': email,
             'phone': phone,
-            'additional_info': additional_info
+            'additional_info': additional_info,
+            'duplicate_fields': duplicate_fields
         }
         
         return redirect(url_for('event_page', event_uuid=event_uuid, rsvp_warning=1, show_confirm=1))
     
     # Save RSVP with verification token and segment handling
     verification_token = str(uuid.uuid4())
-    segment_success = None
-    segment_error = None
     
-    # Add to segment if segment_id is provided
-    if segment_id:
-        segment_success, segment_error = add_contact_to_segment(email, name, segment_id)
-    
-    conn = get_db_connection()
-    if conn:
+    with get_db_connection() as conn:
+        if not conn:
+            return redirect(url_for('event_page', event_uuid=event_uuid, rsvp_error="db_error"))
         try:
             cur = conn.cursor()
-            cur.execute("""
-                INSERT INTO rsvps (event_uuid, name, email, phone, additional_info, verification_token, segment_id, segment_error)
-                VALUES (%s, %s, %s, %s, %s, %s, %s, %s)
-            """, (event_uuid, name, email, phone, additional_info, verification_token, segment_id, segment_error))
+            execute_prepared(cur, "insert_rsvp", INSERT_RSVP_SQL, (event_uuid, name, email, phone, additional_info, verification_token, segment_id))
+            
+            # Bump the registered count in the same transaction
+            execute_prepared(cur, "increment_registered", INCREMENT_REGISTERED_SQL, (event_uuid,))
             conn.commit()
             cur.close()
-            conn.close()
-            
-            # Send the email via Resend
-            email_sent = send_verification_email(email, name, verification_token)
-            
-            if not email_sent:
-                print(f"Failed to send verification email to {email}")
-                # Still continue with RSVP but note the email failure
-            
-            # Update registered count
-            event, _, _ = get_event_from_db(event_uuid)
-            event['registered'] = event.get('registered', 0) + 1
-            save_event_to_db(event, None)
-            
-            return redirect(url_for('event_page', event_uuid=event_uuid, rsvp_success=1))
+            invalidate_cached_event(event_uuid)
+            invalidate_rsvp_count(event_uuid)
+        except psycopg2.errors.UniqueViolation:
+            # Someone with the same name registered between the duplicate check and this INSERT
+            return redirect(url_for('event_page', event_uuid=event_uuid, rsvp_error="name_taken"))
         except Exception as e:
             return redirect(url_for('event_page', event_uuid=event_uuid, rsvp_error="save_failed"))
-    return redirect(url_for('event_page', event_uuid=event_uuid, rsvp_error="db_error"))
+    
+    # Send the email and sync the segment via Resend without blocking the response;
+    # failures are logged (and segment errors stored) by the background tasks
+    verify_url = url_for('verify_email', token=verification_token, _external=True)
+    run_in_background(send_verification_email, email, name, verify_url)
+    
+    # Add to segment if segment_id is provided
+    if segment_id:
+        run_in_background(sync_rsvp_to_segment, email, name, segment_id, verification_token)
+    
+    return redirect(url_for('event_page', event_uuid=event_uuid, rsvp_success=1))
 
 # --- New Route: Email Verification ---
 @app.route("/verify-email/<token>")
 def verify_email(token):
-    conn = get_db_connection()
-    if not conn: return "Database error", 500
-    try:
-        cur = conn.cursor()
-        cur.execute("UPDATE rsvps SET email_verified = TRUE WHERE verification_token = %s RETURNING event_uuid", (token,))
-        result = cur.fetchone()
-        conn.commit()
-        cur.close()
-        conn.close()
-        
-        if result:
-            event_uuid = result[0]
-            return render_template("email_verified.html", event_uuid=event_uuid)
-        return "Invalid or expired token", 404
-    except Exception as e:
-        return f"Error: {e}", 500
+    with get_db_connection() as conn:
+        if not conn: return "Database error", 500
+        try:
+            cur = conn.cursor()
+            execute_prepared(cur, "verify_email", "UPDATE rsvps SET email_verified = TRUE WHERE verification_token = $1 RETURNING event_uuid", (token,))
+            result = cur.fetchone()
+            conn.commit()
+            cur.close()
+        except Exception as e:
+            return f"Error: {e}", 500
+    
+    if result:
+        event_uuid = result[0]
+        return render_template("email_verified.html", event_uuid=event_uuid)
+    return "Invalid or expired token", 404
+
+ADMIN_RSVPS_PER_PAGE = 50
 
 # --- New Route: Event Admin Page ---
 @app.route("/event/<event_uuid>/admin")
@@ -543,38 +1143,61 @@ def event_admin(event_uuid):
     event, _, _ = get_event_from_db(event_uuid)
     if not event: return "Event not found", 404
     
-    conn = get_db_connection()
+    # Keyset pagination: ?before=<rsvp_date>&before_id=<id> of the last row on the previous page
+    before = None
+    before_id = None
+    try:
+        if request.args.get('before') and request.args.get('before_id'):
+            before = datetime.fromisoformat(request.args['before'])
+            before_id = int(request.args['before_id'])
+    except ValueError:
+        before = None
+        before_id = None
+    
     rsvps = []
     email_failures = 0
     segment_errors = 0
-    if conn:
-        cur = conn.cursor()
-        cur.execute("""
-            SELECT name, email, phone, additional_info, email_verified, rsvp_date, segment_error 
-            FROM rsvps WHERE event_uuid = %s ORDER BY rsvp_date DESC
-        """, (event_uuid,))
-        columns = [desc[0] for desc in cur.description]
-        rsvps = [dict(zip(columns, row)) for row in cur.fetchall()]
-        
-        # Check for email verification failures (unverified emails older than 1 hour)
-        cur.execute("""
-            SELECT COUNT(*) FROM rsvps 
-            WHERE event_uuid = %s AND email_verified = FALSE 
-            AND rsvp_date < NOW() - INTERVAL '1 hour'
-        """, (event_uuid,))
-        email_failures = cur.fetchone()[0]
-        
-        # Check for segment errors
-        cur.execute("""
-            SELECT COUNT(*) FROM rsvps 
-            WHERE event_uuid = %s AND segment_error IS NOT NULL
-        """, (event_uuid,))
-        segment_errors = cur.fetchone()[0]
-        
-        cur.close()
-        conn.close()
+    with get_db_connection(autocommit=True) as conn:
+        if conn:
+            cur = conn.cursor(cursor_factory=psycopg2.extras.RealDictCursor)
+            # One round trip returns both warning counts over all RSVPs
+            # (unverified emails older than 1 hour, segment errors) plus one page of attendees.
+            # Each count matches a partial index, so it only reads the matching rows.
+            cur.execute("""
+                SELECT c.email_failures, c.segment_errors,
+                    r.id, r.name, r.email, r.phone, r.additional_info, r.email_verified, r.rsvp_date, r.segment_error
+                FROM (
+                    SELECT
+                        (SELECT COUNT(*) FROM rsvps
+                         WHERE event_uuid = %(event_uuid)s AND email_verified = FALSE
+                         AND rsvp_date < NOW() - INTERVAL '1 hour') AS email_failures,
+                        (SELECT COUNT(*) FROM rsvps
+                         WHERE event_uuid = %(event_uuid)s AND segment_error IS NOT NULL) AS segment_errors
+                ) c
+                LEFT JOIN LATERAL (
+                    SELECT id, name, email, phone, additional_info, email_verified, rsvp_date, segment_error
+                    FROM rsvps
+                    WHERE event_uuid = %(event_uuid)s
+                    AND (%(before)s::timestamp IS NULL OR (rsvp_date, id) < (%(before)s::timestamp, %(before_id)s))
+                    ORDER BY rsvp_date DESC, id DESC
+                    LIMIT %(limit)s
+                ) r ON TRUE
+            """, {'event_uuid': event_uuid, 'before': before, 'before_id': before_id, 'limit': ADMIN_RSVPS_PER_PAGE + 1})
+            rows = cur.fetchall()
+            cur.close()
+            
+            if rows:
+                email_failures = rows[0]['email_failures']
+                segment_errors = rows[0]['segment_errors']
+            rsvps = [row for row in rows if row['id'] is not None]
+    
+    # The extra row only tells us whether an older page exists
+    next_page = None
+    if len(rsvps) > ADMIN_RSVPS_PER_PAGE:
+        rsvps = rsvps[:ADMIN_RSVPS_PER_PAGE]
+        next_page = {'before': rsvps[-1]['rsvp_date'].isoformat(), 'before_id': rsvps[-1]['id']}
     
-    return render_template("event_admin.html", event=event, rsvps=rsvps, email_failures=email_failures, segment_errors=segment_errors)
+    return render_template("event_admin.html", event=event, rsvps=rsvps, email_failures=email_failures, segment_errors=segment_errors, next_page=next_page, is_paged=before is not None)
 
 @app.route("/event/<event_uuid>/admin/login", methods=["GET", "POST"])
 def admin_login(event_uuid):
@@ -590,7 +1213,7 @@ def admin_login(event_uuid):
     
     if request.method == "POST":
         admin_code = request.form.get('admin_code', '').strip()
-        if admin_code and ADMIN_CODE and admin_code == ADMIN_CODE:
+        if isValidAdminCode(admin_code):
             session['admin_authenticated'] = True
             return redirect(url_for('event_admin', event_uuid=event_uuid))
         else:
@@ -624,27 +1247,31 @@ def confirm_rsvp_anyway(event_uuid):
         return redirect(url_for('event_page', event_uuid=event_uuid, rsvp_error="Name and email are required"))
     
     # Save RSVP to database
-    conn = get_db_connection()
-    if conn:
-        try:
-            cur = conn.cursor()
-            cur.execute("""
-                INSERT INTO rsvps (event_uuid, name, email, phone, additional_info)
-                VALUES (%s, %s, %s, %s, %s)
-            """, (event_uuid, name, email, phone, additional_info))
-            conn.commit()
-            cur.close()
-            conn.close()
-            
-            # Update registered count in event data
-            event['registered'] = event.get('registered', 0) + 1
-            save_event_to_db(event, None)
-            
-            # Clear pending RSVP from session
-            session.pop(f'pending_rsvp_{event_uuid}', None)
-        except Exception as e:
-            print(f"Error saving RSVP to database: {e}")
-            return redirect(url_for('event_page', event_uuid=event_uuid, rsvp_error="Error saving RSVP. Please try again."))
+    saved = False
+    with get_db_connection() as conn:
+        if conn:
+            try:
+                cur = conn.cursor()
+                execute_prepared(cur, "insert_confirmed_rsvp", INSERT_CONFIRMED_RSVP_SQL, (event_uuid, name, email, phone, additional_info))
+                
+                # Update registered count in event data
+                execute_prepared(cur, "increment_registered", INCREMENT_REGISTERED_SQL, (event_uuid,))
+                conn.commit()
+                cur.close()
+                saved = True
+            except psycopg2.errors.UniqueViolation:
+                session.pop(f'pending_rsvp_{event_uuid}', None)
+                return redirect(url_for('event_page', event_uuid=event_uuid, rsvp_error="name_taken"))
+            except Exception as e:
+                print(f"Error saving RSVP to database: {e}")
+                return redirect(url_for('event_page', event_uuid=event_uuid, rsvp_error="Error saving RSVP. Please try again."))
+    
+    if saved:
+        invalidate_cached_event(event_uuid)
+        invalidate_rsvp_count(event_uuid)
+        
+        # Clear pending RSVP from session
+        session.pop(f'pending_rsvp_{event_uuid}', None)
     else:
         # Still increment registered count for display
         event['registered'] = event.get('registered', 0) + 1
@@ -659,68 +1286,15 @@ def create_event():
     
     # Verify admin code
     admin_code = request.form.get('admin_code', '').strip()
-    if not admin_code or not ADMIN_CODE or admin_code != ADMIN_CODE:
+    if not isValidAdminCode(admin_code):
         return render_template("create_event.html", error="Invalid admin code")
     
-    # Validate all required fields
-    title = request.form.get('title', '').strip()
-    description = request.form.get('description', '').strip()
-    date = request.form.get('date', '').strip()
-    time = request.form.get('time', '').strip()
-    location = request.form.get('location', '').strip()
-    address = request.form.get('address', '').strip()
-    organizer = request.form.get('organizer', '').strip()
-    
-    # Optional fields
-    capacity = request.form.get('capacity', '').strip()
-    price = request.form.get('price', '').strip()
     passcode = request.form.get('passcode', '').strip()
     segment_id = request.form.get('segment_id', '').strip()
-    image = request.form.get('image', '').strip()
-    tags = request.form.get('tags', '').strip()
-    
-    # Check required fields are present
-    if not all([title, description, date, time, location, address, organizer]):
-        return render_template("create_event.html", error="All marked fields (*) are required")
-    
-    # Validate optional numeric fields if provided
-    try:
-        if capacity:
-            capacity = int(capacity)
-            if capacity < 1:
-                raise ValueError("Capacity must be at least 1")
-        else:
-            capacity = None
-        
-        if price:
-            price = float(price)
-            if price < 0:
-                raise ValueError("Price cannot be negative")
-        else:
-            price = None
-    except ValueError as e:
-        return render_template("create_event.html", error=f"Invalid capacity or price: {str(e)}")
-    
-    # Validate image URL if provided
-    if image and not isValidUrl(image):
-        return render_template("create_event.html", error="Image URL must be a valid URL")
     
-    # Create new event data
-    event_data = {
-        'uuid': str(uuid.uuid4()),
-        'title': title,
-        'description': description,
-        'date': date,
-        'time': time,
-        'location': location,
-        'address': address,
-        'capacity': capacity,
-        'registered': 0,
-        'price': price,
-        'organizer': organizer,
-        'tags': [tag.strip() for tag in tags.split(',') if tag.strip()] if tags else [],
-        'image': image if image else None
-    }
+    event_data, error = build_event_from_form(request.form)
+    if error:
+        return render_template("create_event.html", error=error)
     
     # Save to database
     event_uuid = save_event_to_db(event_data, passcode if passcode else None, segment_id if segment_id else None)
@@ -919,18 +1493,21 @@ def event_created_success(event_uuid):
 # API Routes
 @app.route("/api/signup", methods=["POST"])
 def signup():
-    user = request.json
-    return jsonify(user)
+    if not request.is_json:
+        return jsonify({"error": "Expected a JSON body"}), 415
+    # Echo the body back as-is; it is only parsed to check it is valid JSON
+    body = request.get_data(cache=False)
+    try:
+        orjson.loads(body)
+    except orjson.JSONDecodeError:
+        return jsonify({"error": "Invalid JSON"}), 400
+    return app.response_class(body, mimetype="application/json")
 
 if __name__ == '__main__':
-    # Initialize database tables if available
-    if db_url:
-        print("Initializing database...")
-        if init_db():
-            print("Database initialized successfully")
-        else:
-            print("Database initialization failed, running without database")
-    else:
+    # Tables are created once per deploy with `flask --app main init-db`, not on every start
+    if not db_url:
         print("No DATABASE_URL provided, running without database")
     
+    # Development server only; production runs `gunicorn main:app` (see gunicorn.conf.py)
+    print("Starting development server, use `gunicorn main:app` in production")
     app.run(host='0.0.0.0', port=8080)